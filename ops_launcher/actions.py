@@ -6,10 +6,14 @@ and how to build the command(s) to execute.
 
 from __future__ import annotations
 
+import functools
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from enum import Enum
+from pathlib import Path
+from typing import Any
 
-from ops_launcher.config import Host, SSHDefaults
+from ops_launcher.config import Host, SSHDefaults, control_socket_dir
 from ops_launcher.ssh import build_remote_command, build_ssh_command
 
 
@@ -30,15 +34,17 @@ class Action:
     name: str
     label: str
     category: ActionCategory
-    required_tags: list[str] = field(default_factory=list)
+    required_tags: frozenset[str] = field(default_factory=frozenset)
     destructive: bool = False
     description: str = ""
 
+    def __post_init__(self) -> None:
+        # Accept any iterable of tags; store a frozenset for subset checks.
+        object.__setattr__(self, "required_tags", frozenset(self.required_tags))
+
     def is_available_for(self, host: Host) -> bool:
         """Check if this action is applicable for the given host's tags."""
-        if not self.required_tags:
-            return True  # universal action
-        return all(tag in host.tags for tag in self.required_tags)
+        return self.required_tags <= host.tags_set
 
 
 # ---------------------------------------------------------------------------
@@ -62,35 +68,35 @@ BUILTIN_ACTIONS: list[Action] = [
         name="docker_ps",
         label="Docker PS",
         category=ActionCategory.DOCKER,
-        required_tags=["docker"],
+        required_tags=frozenset({"docker"}),
         description="List running containers.",
     ),
     Action(
         name="docker_stats",
         label="Docker Stats",
         category=ActionCategory.DOCKER,
-        required_tags=["docker"],
+        required_tags=frozenset({"docker"}),
         description="Show live container resource usage.",
     ),
     Action(
         name="docker_logs",
         label="Docker Logs (select service)",
         category=ActionCategory.DOCKER,
-        required_tags=["docker"],
+        required_tags=frozenset({"docker"}),
         description="Tail logs for a docker compose service.",
     ),
     Action(
         name="compose_ps",
         label="Compose PS",
         category=ActionCategory.COMPOSE,
-        required_tags=["docker"],
+        required_tags=frozenset({"docker"}),
         description="Show compose service status.",
     ),
     Action(
         name="compose_up",
         label="Compose Up",
         category=ActionCategory.COMPOSE,
-        required_tags=["docker"],
+        required_tags=frozenset({"docker"}),
         destructive=False,
         description="Start compose services (detached).",
     ),
@@ -98,7 +104,7 @@ BUILTIN_ACTIONS: list[Action] = [
         name="compose_down",
         label="Compose Down",
         category=ActionCategory.COMPOSE,
-        required_tags=["docker"],
+        required_tags=frozenset({"docker"}),
         destructive=True,
         description="Stop and remove compose services.",
     ),
@@ -106,7 +112,7 @@ BUILTIN_ACTIONS: list[Action] = [
         name="compose_restart",
         label="Compose Restart",
         category=ActionCategory.COMPOSE,
-        required_tags=["docker"],
+        required_tags=frozenset({"docker"}),
         destructive=True,
         description="Restart compose services.",
     ),
@@ -114,7 +120,7 @@ BUILTIN_ACTIONS: list[Action] = [
         name="compose_logs",
         label="Compose Logs (follow)",
         category=ActionCategory.COMPOSE,
-        required_tags=["docker"],
+        required_tags=frozenset({"docker"}),
         description="Tail all compose logs.",
     ),
     # --- Tag-specific actions ---
@@ -122,14 +128,14 @@ BUILTIN_ACTIONS: list[Action] = [
         name="nginx_status",
         label="Nginx Status",
         category=ActionCategory.HEALTH,
-        required_tags=["nginx"],
+        required_tags=frozenset({"nginx"}),
         description="Show nginx status and active connections.",
     ),
     Action(
         name="nginx_reload",
         label="Nginx Reload",
         category=ActionCategory.HEALTH,
-        required_tags=["nginx"],
+        required_tags=frozenset({"nginx"}),
         destructive=True,
         description="Reload nginx configuration.",
     ),
@@ -137,42 +143,115 @@ BUILTIN_ACTIONS: list[Action] = [
         name="postgres_status",
         label="PostgreSQL Status",
         category=ActionCategory.HEALTH,
-        required_tags=["postgres"],
+        required_tags=frozenset({"postgres"}),
         description="Show PostgreSQL connections and DB sizes.",
     ),
     Action(
         name="redis_info",
         label="Redis Info",
         category=ActionCategory.HEALTH,
-        required_tags=["redis"],
+        required_tags=frozenset({"redis"}),
         description="Show Redis server info and memory usage.",
     ),
     Action(
         name="celery_inspect",
         label="Celery Inspect",
         category=ActionCategory.HEALTH,
-        required_tags=["celery"],
+        required_tags=frozenset({"celery"}),
         description="Show active Celery workers and queues.",
     ),
     Action(
         name="traefik_status",
         label="Traefik Status",
         category=ActionCategory.HEALTH,
-        required_tags=["traefik"],
+        required_tags=frozenset({"traefik"}),
         description="Show Traefik routers and services.",
     ),
 ]
 
+ACTIONS_BY_NAME: dict[str, Action] = {a.name: a for a in BUILTIN_ACTIONS}
+
 
 def get_actions_for_host(host: Host) -> list[Action]:
     """Return actions available for the given host based on its tags."""
-    return [a for a in BUILTIN_ACTIONS if a.is_available_for(host)]
+    return list(_actions_for_tags(host.tags_set))
+
+
+@functools.cache
+def _actions_for_tags(tags: frozenset[str]) -> tuple[Action, ...]:
+    """Filter the registry once per distinct tag set."""
+    return tuple(a for a in BUILTIN_ACTIONS if a.required_tags <= tags)
 
 
 # ---------------------------------------------------------------------------
 # Command builders for each action
 # ---------------------------------------------------------------------------
 
+# Static remote shell snippets, built once at import time.
+_HEALTH_REMOTE_TEMPLATE = (
+    "echo '=== Uptime ===' && uptime && "
+    "echo '\\n=== OS ===' && "
+    "(cat /etc/os-release 2>/dev/null | head -2 "
+    "|| sw_vers 2>/dev/null || uname -a) && "
+    "echo '\\n=== Disk ===' && df -h / && "
+    "echo '\\n=== Memory ===' && "
+    "(free -h 2>/dev/null || vm_stat 2>/dev/null) && "
+    "echo '\\n=== Load ===' && "
+    "(cat /proc/loadavg 2>/dev/null "
+    "|| sysctl -n vm.loadavg 2>/dev/null || uptime) && "
+    "echo '\\n=== Docker ===' && {docker}"
+)
+_DOCKER_PS_FALLBACK = (
+    'docker ps --format "table {{.Names}}\\t{{.Status}}" '
+    '2>/dev/null || echo "Docker not available"'
+)
+_DOCKER_PS = "docker ps --format 'table {{.Names}}\\t{{.Status}}\\t{{.Ports}}'"
+_DOCKER_STATS = (
+    "docker stats --no-stream --format 'table {{.Name}}\\t{{.CPUPerc}}\\t{{.MemUsage}}'"
+)
+_NGINX_STATUS_REMOTE = (
+    "echo '=== Nginx Status ===' && "
+    "sudo nginx -t 2>&1 && "
+    "echo '\\n=== Active Connections ===' && "
+    "curl -s http://localhost/nginx_status 2>/dev/null "
+    "|| echo 'stub_status not enabled'"
+)
+_NGINX_RELOAD_REMOTE = "sudo nginx -s reload"
+_POSTGRES_STATUS_REMOTE = (
+    "echo '=== PostgreSQL Connections ===' && "
+    "sudo -u postgres psql -c "
+    "\"SELECT state, count(*) FROM pg_stat_activity "
+    "GROUP BY state;\" 2>/dev/null && "
+    "echo '\\n=== Database Sizes ===' && "
+    "sudo -u postgres psql -c "
+    "\"SELECT datname, pg_size_pretty("
+    "pg_database_size(datname)) FROM pg_database "
+    "ORDER BY pg_database_size(datname) DESC;\" "
+    "2>/dev/null"
+)
+_REDIS_INFO_REMOTE = (
+    "echo '=== Redis Info ===' && "
+    "redis-cli info server 2>/dev/null | head -15 && "
+    "echo '\\n=== Memory ===' && "
+    "redis-cli info memory 2>/dev/null | head -10 && "
+    "echo '\\n=== Clients ===' && "
+    "redis-cli info clients 2>/dev/null | head -5"
+)
+_CELERY_INSPECT_REMOTE = (
+    "docker compose exec -T worker "
+    "celery -A config inspect active 2>/dev/null "
+    "|| echo 'Celery inspect not available'"
+)
+_TRAEFIK_STATUS_REMOTE = (
+    "echo '=== Traefik Routers ===' && "
+    "curl -s http://localhost:8080/api/http/routers "
+    "2>/dev/null | python3 -m json.tool 2>/dev/null "
+    "|| echo 'Traefik API not available'"
+)
+
+# A remote builder returns (remote_command, allocate_tty) for a docker user.
+_RemoteBuilder = Callable[..., tuple[str, bool]]
+
 
 def build_action_command(
     action: Action,
@@ -187,157 +266,140 @@ def build_action_command(
 
     Returns the full command to execute locally (typically an ssh invocation).
     """
-    match action.name:
-        case "ssh":
-            return build_ssh_command(host, ssh_defaults)
-
-        case "health":
-            remote = (
-                "echo '=== Uptime ===' && uptime && "
-                "echo '\\n=== OS ===' && "
-                "(cat /etc/os-release 2>/dev/null | head -2 "
-                "|| sw_vers 2>/dev/null || uname -a) && "
-                "echo '\\n=== Disk ===' && df -h / && "
-                "echo '\\n=== Memory ===' && "
-                "(free -h 2>/dev/null || vm_stat 2>/dev/null) && "
-                "echo '\\n=== Load ===' && "
-                "(cat /proc/loadavg 2>/dev/null "
-                "|| sysctl -n vm.loadavg 2>/dev/null || uptime) && "
-                "echo '\\n=== Docker ===' && "
-                + _docker_command(
-                    host,
-                    'docker ps --format "table {{.Names}}\\t{{.Status}}" '
-                    '2>/dev/null || echo "Docker not available"'
-                )
-            )
-            return build_remote_command(host, ssh_defaults, remote)
-
-        case "docker_ps":
-            docker_ps_fmt = _docker_command(
-                host,
-                "docker ps --format 'table {{.Names}}\\t{{.Status}}\\t{{.Ports}}'"
-            )
-            return build_remote_command(
-                host, ssh_defaults, docker_ps_fmt,
-            )
-
-        case "docker_stats":
-            docker_stats_fmt = _docker_command(
-                host,
-                "docker stats --no-stream --format 'table {{.Name}}\\t{{.CPUPerc}}\\t{{.MemUsage}}'"
-            )
-            return build_remote_command(
-                host, ssh_defaults, docker_stats_fmt,
-            )
-
-        case "docker_logs":
-            svc = service or ""
-            docker_cmd = f"docker logs --tail 100 {'-f' if follow else ''} {svc}".strip()
-            tail_cmd = _docker_command(host, docker_cmd)
-            return build_remote_command(host, ssh_defaults, tail_cmd, allocate_tty=follow)
-
-        case "compose_ps":
-            cd_prefix = _compose_cd(compose_path)
-            compose_cmd = f"{cd_prefix}docker compose ps"
-            docker_cmd = _docker_command(host, compose_cmd)
-            return build_remote_command(host, ssh_defaults, docker_cmd)
-
-        case "compose_up":
-            cd_prefix = _compose_cd(compose_path)
-            compose_cmd = f"{cd_prefix}docker compose up -d"
-            docker_cmd = _docker_command(host, compose_cmd)
-            return build_remote_command(host, ssh_defaults, docker_cmd)
-
-        case "compose_down":
-            cd_prefix = _compose_cd(compose_path)
-            compose_cmd = f"{cd_prefix}docker compose down"
-            docker_cmd = _docker_command(host, compose_cmd)
-            return build_remote_command(host, ssh_defaults, docker_cmd)
-
-        case "compose_restart":
-            cd_prefix = _compose_cd(compose_path)
-            compose_cmd = f"{cd_prefix}docker compose restart"
-            docker_cmd = _docker_command(host, compose_cmd)
-            return build_remote_command(host, ssh_defaults, docker_cmd)
-
-        case "compose_logs":
-            cd_prefix = _compose_cd(compose_path)
-            compose_cmd = f"{cd_prefix}docker compose logs --tail 100 -f"
-            docker_cmd = _docker_command(host, compose_cmd)
-            return build_remote_command(
-                host, ssh_defaults, docker_cmd,
-                allocate_tty=True,
-            )
-
-        # --- Tag-specific actions ---
-        case "nginx_status":
-            remote = (
-                "echo '=== Nginx Status ===' && "
-                "sudo nginx -t 2>&1 && "
-                "echo '\\n=== Active Connections ===' && "
-                "curl -s http://localhost/nginx_status 2>/dev/null "
-                "|| echo 'stub_status not enabled'"
-            )
-            return build_remote_command(host, ssh_defaults, remote)
-
-        case "nginx_reload":
-            return build_remote_command(
-                host, ssh_defaults, "sudo nginx -s reload",
-            )
-
-        case "postgres_status":
-            remote = (
-                "echo '=== PostgreSQL Connections ===' && "
-                "sudo -u postgres psql -c "
-                "\"SELECT state, count(*) FROM pg_stat_activity "
-                "GROUP BY state;\" 2>/dev/null && "
-                "echo '\\n=== Database Sizes ===' && "
-                "sudo -u postgres psql -c "
-                "\"SELECT datname, pg_size_pretty("
-                "pg_database_size(datname)) FROM pg_database "
-                "ORDER BY pg_database_size(datname) DESC;\" "
-                "2>/dev/null"
-            )
-            return build_remote_command(host, ssh_defaults, remote)
-
-        case "redis_info":
-            remote = (
-                "echo '=== Redis Info ===' && "
-                "redis-cli info server 2>/dev/null | head -15 && "
-                "echo '\\n=== Memory ===' && "
-                "redis-cli info memory 2>/dev/null | head -10 && "
-                "echo '\\n=== Clients ===' && "
-                "redis-cli info clients 2>/dev/null | head -5"
-            )
-            return build_remote_command(host, ssh_defaults, remote)
-
-        case "celery_inspect":
-            cd_prefix = _compose_cd(compose_path)
-            remote = (
-                f"{cd_prefix}"
-                "docker compose exec -T worker "
-                "celery -A config inspect active 2>/dev/null "
-                "|| echo 'Celery inspect not available'"
-            )
-            return build_remote_command(host, ssh_defaults, remote)
-
-        case "traefik_status":
-            remote = (
-                "echo '=== Traefik Routers ===' && "
-                "curl -s http://localhost:8080/api/http/routers "
-                "2>/dev/null | python3 -m json.tool 2>/dev/null "
-                "|| echo 'Traefik API not available'"
-            )
-            return build_remote_command(host, ssh_defaults, remote)
-
-        case _:
-            raise ValueError(f"Unknown action: {action.name}")
-
-
-def _docker_command(host: Host, command: str) -> str:
+    if action.name in _CACHEABLE_ACTIONS:
+        # The ControlPath comes from the environment, so it is part of the key.
+        socket_dir = control_socket_dir() if ssh_defaults.multiplex else None
+        return list(_build_cached(action.name, host, ssh_defaults, socket_dir))
+    return _build(
+        action.name, host, ssh_defaults,
+        service=service, follow=follow, compose_path=compose_path,
+    )
+
+
+def _build(action_name: str, host: Host, ssh_defaults: SSHDefaults, **kwargs: Any) -> list[str]:
+    """Build the full local command for one action on one host."""
+    if action_name == "ssh":
+        return build_ssh_command(host, ssh_defaults)
+    remote_cmd, allocate_tty = _build_remote(action_name, host.docker_user, **kwargs)
+    return build_remote_command(host, ssh_defaults, remote_cmd, allocate_tty=allocate_tty)
+
+
+def _build_remote(action_name: str, docker_user: str | None, **kwargs: Any) -> tuple[str, bool]:
+    """Dispatch to the remote builder registered for *action_name*."""
+    builder = _REMOTE_BUILDERS.get(action_name)
+    if builder is None:
+        raise ValueError(f"Unknown action: {action_name}")
+    return builder(docker_user, **kwargs)
+
+
+def _remote_health(docker_user: str | None, **_: object) -> tuple[str, bool]:
+    docker = _docker_command(docker_user, _DOCKER_PS_FALLBACK)
+    return _HEALTH_REMOTE_TEMPLATE.format(docker=docker), False
+
+
+def _remote_docker_logs(
+    docker_user: str | None,
+    *,
+    service: str | None = None,
+    follow: bool = False,
+    **_: object,
+) -> tuple[str, bool]:
+    svc = service or ""
+    docker_cmd = f"docker logs --tail 100 {'-f' if follow else ''} {svc}".strip()
+    return _docker_command(docker_user, docker_cmd), follow
+
+
+def _remote_celery_inspect(
+    docker_user: str | None,
+    *,
+    compose_path: str | None = None,
+    **_: object,
+) -> tuple[str, bool]:
+    return _compose_cd(compose_path) + _CELERY_INSPECT_REMOTE, False
+
+
+def _docker_remote(command: str) -> _RemoteBuilder:
+    """Return a remote builder running a fixed docker command."""
+
+    def build(docker_user: str | None, **_: object) -> tuple[str, bool]:
+        return _docker_command(docker_user, command), False
+
+    return build
+
+
+def _compose_remote(subcommand: str, *, allocate_tty: bool = False) -> _RemoteBuilder:
+    """Return a remote builder running ``docker compose <subcommand>`` in the project dir."""
+
+    def build(
+        docker_user: str | None,
+        *,
+        compose_path: str | None = None,
+        **_: object,
+    ) -> tuple[str, bool]:
+        compose_cmd = f"{_compose_cd(compose_path)}docker compose {subcommand}"
+        return _docker_command(docker_user, compose_cmd), allocate_tty
+
+    return build
+
+
+def _static_remote(remote: str) -> _RemoteBuilder:
+    """Return a remote builder for a fixed remote command."""
+
+    def build(docker_user: str | None, **_: object) -> tuple[str, bool]:
+        return remote, False
+
+    return build
+
+
+_REMOTE_BUILDERS: dict[str, _RemoteBuilder] = {
+    "health": _remote_health,
+    "docker_ps": _docker_remote(_DOCKER_PS),
+    "docker_stats": _docker_remote(_DOCKER_STATS),
+    "docker_logs": _remote_docker_logs,
+    "compose_ps": _compose_remote("ps"),
+    "compose_up": _compose_remote("up -d"),
+    "compose_down": _compose_remote("down"),
+    "compose_restart": _compose_remote("restart"),
+    "compose_logs": _compose_remote("logs --tail 100 -f", allocate_tty=True),
+    # --- Tag-specific actions ---
+    "nginx_status": _static_remote(_NGINX_STATUS_REMOTE),
+    "nginx_reload": _static_remote(_NGINX_RELOAD_REMOTE),
+    "postgres_status": _static_remote(_POSTGRES_STATUS_REMOTE),
+    "redis_info": _static_remote(_REDIS_INFO_REMOTE),
+    "celery_inspect": _remote_celery_inspect,
+    "traefik_status": _static_remote(_TRAEFIK_STATUS_REMOTE),
+}
+
+# Actions whose command depends only on (host, ssh_defaults).
+_CACHEABLE_ACTIONS = frozenset({
+    "ssh",
+    "health",
+    "docker_ps",
+    "docker_stats",
+    "nginx_status",
+    "nginx_reload",
+    "postgres_status",
+    "redis_info",
+    "traefik_status",
+})
+
+
+@functools.lru_cache(maxsize=256)
+def _build_cached(
+    action_name: str, host: Host, ssh_defaults: SSHDefaults, socket_dir: Path | None
+) -> tuple[str, ...]:
+    """Memoized builder for parameterless actions; returns an immutable command.
+
+    *socket_dir* is only a cache key: the ssh builder reads the current
+    control_socket_dir() itself.
+    """
+    return tuple(_build(action_name, host, ssh_defaults))
+
+
+def _docker_command(docker_user: str | None, command: str) -> str:
     """Build a docker command, optionally with sudo -u docker_user."""
-    if host.docker_user:
-        return f"sudo -n -u {host.docker_user} {command}"
+    if docker_user:
+        return f"sudo -n -u {docker_user} {command}"
     return command
 
 
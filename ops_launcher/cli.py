@@ -10,6 +10,7 @@ from typing import Annotated, Optional
 
 import typer
 from rich.panel import Panel
+from typer.core import TyperGroup
 
 from ops_launcher import __version__
 from ops_launcher.config import (
@@ -24,8 +25,23 @@ from ops_launcher.utils import console, print_error, print_info
 # App setup
 # ---------------------------------------------------------------------------
 
+
+class _LazyStubGroup(TyperGroup):
+    """Root group that only builds the gcp/tf stub groups when they are requested."""
+
+    def list_commands(self, ctx):
+        names = super().list_commands(ctx)
+        return names + [n for n in _STUB_APPS if n not in names]
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in _STUB_APPS and cmd_name not in self.commands:
+            self.add_command(typer.main.get_group(_STUB_APPS[cmd_name]), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
 app = typer.Typer(
     name="ops",
+    cls=_LazyStubGroup,
     help="⚡ Ops Launcher — interactive terminal tool for managing infrastructure.",
     no_args_is_help=False,
     rich_markup_mode="rich",
@@ -44,7 +60,7 @@ compose_app = typer.Typer(
     rich_markup_mode="rich",
 )
 
-# Future stubs
+# Future stubs — registered lazily via _LazyStubGroup
 gcp_app = typer.Typer(
     name="gcp",
     help="[dim]Google Cloud Platform shortcuts (coming soon).[/dim]",
@@ -59,8 +75,12 @@ tf_app = typer.Typer(
 
 app.add_typer(docker_app, name="docker")
 app.add_typer(compose_app, name="compose")
-app.add_typer(gcp_app, name="gcp")
-app.add_typer(tf_app, name="tf")
+
+# Shared parameter annotations
+HostRefArg = Annotated[str, typer.Argument(help="Host name or client:host.")]
+ProjectDirOpt = Annotated[
+    Optional[str], typer.Option("--project-dir", "-d", help="Remote compose project directory.")
+]
 
 
 # ---------------------------------------------------------------------------
@@ -86,6 +106,19 @@ def _resolve_host_or_exit(config: OpsConfig, host_ref: str):
         raise typer.Exit(1)
 
 
+def _stream_action(host_ref: str, action_name: str) -> None:
+    """Run a parameterless action on a host, streaming output, and exit with its code."""
+    config = _load_config_or_exit()
+    host = _resolve_host_or_exit(config, host_ref)
+
+    from ops_launcher.actions import ACTIONS_BY_NAME, build_action_command
+    from ops_launcher.executor import run_streaming
+
+    cmd = build_action_command(ACTIONS_BY_NAME[action_name], host, config.ssh_defaults)
+    exit_code = run_streaming(cmd)
+    raise typer.Exit(exit_code)
+
+
 # ---------------------------------------------------------------------------
 # Default callback — interactive TUI when no subcommand given
 # ---------------------------------------------------------------------------
@@ -119,46 +152,22 @@ def main(
 @app.command("ls")
 def cmd_ls(
     search: Annotated[
-        Optional[str], typer.Argument(help="Optional search filter.")
+        Optional[str], typer.Argument(help="Optional search filter (tag:NAME for an exact tag).")
     ] = None,
 ):
     """List all clients and hosts in a table."""
     config = _load_config_or_exit()
 
-    if search:
-        from ops_launcher.tui import print_hosts_table
+    from ops_launcher.tui import print_hosts_table
 
-        # Create a filtered config view
+    if search:
         matched = config.search_hosts(search)
         if not matched:
             print_info(f"No hosts matching '{search}'.")
             raise typer.Exit()
 
-        # Group back into clients for display
-        from ops_launcher.config import Client
-
-        clients_map: dict[str, list] = {}
-        for h in matched:
-            clients_map.setdefault(h.client, []).append(h)
-
-        filtered_clients = []
-        for cname, hosts in clients_map.items():
-            orig = config.get_client(cname)
-            filtered_clients.append(
-                Client(name=cname, description=orig.description if orig else "", hosts=hosts)
-            )
-
-        filtered_cfg = OpsConfig(
-            version=config.version,
-            ssh_defaults=config.ssh_defaults,
-            clients=filtered_clients,
-            config_path=config.config_path,
-        )
-        filtered_cfg._build_indexes()
-        print_hosts_table(filtered_cfg)
+        print_hosts_table(config, matched)
     else:
-        from ops_launcher.tui import print_hosts_table
-
         print_hosts_table(config)
 
 
@@ -169,7 +178,7 @@ def cmd_ls(
 
 @app.command("ssh")
 def cmd_ssh(
-    host_ref: Annotated[str, typer.Argument(help="Host name or client:host.")],
+    host_ref: HostRefArg,
 ):
     """Open an SSH session to a host."""
     config = _load_config_or_exit()
@@ -189,19 +198,10 @@ def cmd_ssh(
 
 @app.command("health")
 def cmd_health(
-    host_ref: Annotated[str, typer.Argument(help="Host name or client:host.")],
+    host_ref: HostRefArg,
 ):
     """Run health checks on a remote host (uptime, disk, memory, load)."""
-    config = _load_config_or_exit()
-    host = _resolve_host_or_exit(config, host_ref)
-
-    from ops_launcher.actions import BUILTIN_ACTIONS, build_action_command
-    from ops_launcher.executor import run_streaming
-
-    action = next(a for a in BUILTIN_ACTIONS if a.name == "health")
-    cmd = build_action_command(action, host, config.ssh_defaults)
-    exit_code = run_streaming(cmd)
-    raise typer.Exit(exit_code)
+    _stream_action(host_ref, "health")
 
 
 # ---------------------------------------------------------------------------
@@ -211,24 +211,15 @@ def cmd_health(
 
 @docker_app.command("ps")
 def docker_ps(
-    host_ref: Annotated[str, typer.Argument(help="Host name or client:host.")],
+    host_ref: HostRefArg,
 ):
     """List running Docker containers on a remote host."""
-    config = _load_config_or_exit()
-    host = _resolve_host_or_exit(config, host_ref)
-
-    from ops_launcher.actions import BUILTIN_ACTIONS, build_action_command
-    from ops_launcher.executor import run_streaming
-
-    action = next(a for a in BUILTIN_ACTIONS if a.name == "docker_ps")
-    cmd = build_action_command(action, host, config.ssh_defaults)
-    exit_code = run_streaming(cmd)
-    raise typer.Exit(exit_code)
+    _stream_action(host_ref, "docker_ps")
 
 
 @docker_app.command("logs")
 def docker_logs(
-    host_ref: Annotated[str, typer.Argument(help="Host name or client:host.")],
+    host_ref: HostRefArg,
     service: Annotated[str, typer.Argument(help="Container or service name.")],
     follow: Annotated[bool, typer.Option("--follow", "-f", help="Follow log output.")] = False,
 ):
@@ -236,10 +227,10 @@ def docker_logs(
     config = _load_config_or_exit()
     host = _resolve_host_or_exit(config, host_ref)
 
-    from ops_launcher.actions import BUILTIN_ACTIONS, build_action_command
+    from ops_launcher.actions import ACTIONS_BY_NAME, build_action_command
     from ops_launcher.executor import run_interactive, run_streaming
 
-    action = next(a for a in BUILTIN_ACTIONS if a.name == "docker_logs")
+    action = ACTIONS_BY_NAME["docker_logs"]
     cmd = build_action_command(action, host, config.ssh_defaults, service=service, follow=follow)
 
     if follow:
@@ -251,19 +242,10 @@ def docker_logs(
 
 @docker_app.command("stats")
 def docker_stats(
-    host_ref: Annotated[str, typer.Argument(help="Host name or client:host.")],
+    host_ref: HostRefArg,
 ):
     """Show Docker resource usage on a remote host."""
-    config = _load_config_or_exit()
-    host = _resolve_host_or_exit(config, host_ref)
-
-    from ops_launcher.actions import BUILTIN_ACTIONS, build_action_command
-    from ops_launcher.executor import run_streaming
-
-    action = next(a for a in BUILTIN_ACTIONS if a.name == "docker_stats")
-    cmd = build_action_command(action, host, config.ssh_defaults)
-    exit_code = run_streaming(cmd)
-    raise typer.Exit(exit_code)
+    _stream_action(host_ref, "docker_stats")
 
 
 # ---------------------------------------------------------------------------
@@ -280,11 +262,11 @@ def _compose_command(
     config = _load_config_or_exit()
     host = _resolve_host_or_exit(config, host_ref)
 
-    from ops_launcher.actions import BUILTIN_ACTIONS, build_action_command
+    from ops_launcher.actions import ACTIONS_BY_NAME, build_action_command
     from ops_launcher.executor import run_interactive, run_streaming
     from ops_launcher.utils import confirm_action
 
-    action = next(a for a in BUILTIN_ACTIONS if a.name == action_name)
+    action = ACTIONS_BY_NAME[action_name]
 
     if action.destructive:
         if not confirm_action(f"Run '{action.label}' on {host.display}?"):
@@ -304,10 +286,8 @@ def _compose_command(
 
 @compose_app.command("ps")
 def compose_ps_cmd(
-    host_ref: Annotated[str, typer.Argument(help="Host name or client:host.")],
-    project_dir: Annotated[
-        Optional[str], typer.Option("--project-dir", "-d", help="Remote compose project directory.")
-    ] = None,
+    host_ref: HostRefArg,
+    project_dir: ProjectDirOpt = None,
 ):
     """Show Docker Compose service status."""
     _compose_command(host_ref, "compose_ps", project_dir)
@@ -315,10 +295,8 @@ def compose_ps_cmd(
 
 @compose_app.command("up")
 def compose_up_cmd(
-    host_ref: Annotated[str, typer.Argument(help="Host name or client:host.")],
-    project_dir: Annotated[
-        Optional[str], typer.Option("--project-dir", "-d", help="Remote compose project directory.")
-    ] = None,
+    host_ref: HostRefArg,
+    project_dir: ProjectDirOpt = None,
 ):
     """Start Docker Compose services (detached)."""
     _compose_command(host_ref, "compose_up", project_dir)
@@ -326,10 +304,8 @@ def compose_up_cmd(
 
 @compose_app.command("down")
 def compose_down_cmd(
-    host_ref: Annotated[str, typer.Argument(help="Host name or client:host.")],
-    project_dir: Annotated[
-        Optional[str], typer.Option("--project-dir", "-d", help="Remote compose project directory.")
-    ] = None,
+    host_ref: HostRefArg,
+    project_dir: ProjectDirOpt = None,
 ):
     """Stop and remove Docker Compose services. [red]Destructive.[/red]"""
     _compose_command(host_ref, "compose_down", project_dir)
@@ -337,10 +313,8 @@ def compose_down_cmd(
 
 @compose_app.command("restart")
 def compose_restart_cmd(
-    host_ref: Annotated[str, typer.Argument(help="Host name or client:host.")],
-    project_dir: Annotated[
-        Optional[str], typer.Option("--project-dir", "-d", help="Remote compose project directory.")
-    ] = None,
+    host_ref: HostRefArg,
+    project_dir: ProjectDirOpt = None,
 ):
     """Restart Docker Compose services. [red]Destructive.[/red]"""
     _compose_command(host_ref, "compose_restart", project_dir)
@@ -348,10 +322,8 @@ def compose_restart_cmd(
 
 @compose_app.command("logs")
 def compose_logs_cmd(
-    host_ref: Annotated[str, typer.Argument(help="Host name or client:host.")],
-    project_dir: Annotated[
-        Optional[str], typer.Option("--project-dir", "-d", help="Remote compose project directory.")
-    ] = None,
+    host_ref: HostRefArg,
+    project_dir: ProjectDirOpt = None,
 ):
     """Tail Docker Compose logs (follow mode)."""
     _compose_command(host_ref, "compose_logs", project_dir)
@@ -462,6 +434,9 @@ def tf_apply():
     raise typer.Exit(0)
 
 
+_STUB_APPS: dict[str, typer.Typer] = {"gcp": gcp_app, "tf": tf_app}
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
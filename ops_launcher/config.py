@@ -6,12 +6,17 @@ Provides typed dataclasses, validation, and fast host lookup by name or client:n
 
 from __future__ import annotations
 
+import contextlib
 import os
-from dataclasses import dataclass, field
+import pickle
+import sys
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 from typing import Any
 
-import yaml
+from ops_launcher import __version__
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -21,6 +26,9 @@ APP_NAME = "ops-launcher"
 DEFAULT_CONFIG_DIR = Path.home() / ".config" / APP_NAME
 DEFAULT_CONFIG_PATH = DEFAULT_CONFIG_DIR / "hosts.yaml"
 ENV_CONFIG_VAR = "OPS_CONFIG"
+ENV_NO_CACHE_VAR = "OPS_NO_CACHE"
+CACHE_SUFFIX = ".cache"
+CONTROL_PERSIST = "60s"
 SUPPORTED_CONFIG_VERSION = 1
 
 # ---------------------------------------------------------------------------
@@ -30,30 +38,46 @@ SUPPORTED_CONFIG_VERSION = 1
 
 @dataclass(frozen=True, slots=True)
 class Host:
-    """A single managed host."""
+    """A single managed host.
+
+    ``tags`` keeps the configured order for display; ``tags_set`` is derived
+    from it for membership and subset checks.
+    """
 
     name: str
     host: str
     user: str = "root"
     port: int = 22
-    tags: list[str] = field(default_factory=list)
+    tags: tuple[str, ...] = ()
     ssh_alias: str | None = None
     client: str = ""  # back-reference populated at load time
     compose_path: str | None = None  # remote path to docker-compose project dir
     stack_name: str | None = None    # docker compose project/stack name
     project_dir: str | None = None   # general-purpose remote project directory
     docker_user: str | None = None  # user to run docker commands as (via sudo -u)
+    tags_set: frozenset[str] = field(init=False, repr=False, compare=False)
+    _display: str = field(init=False, repr=False, compare=False)
+    _ssh_target: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Frozen: bypass __setattr__ to normalise tags and fill derived values once.
+        object.__setattr__(self, "tags", tuple(self.tags))
+        object.__setattr__(self, "tags_set", frozenset(self.tags))
+        object.__setattr__(
+            self, "_display", f"{self.client}:{self.name}" if self.client else self.name
+        )
+        object.__setattr__(
+            self, "_ssh_target", self.ssh_alias or f"{self.user}@{self.host}"
+        )
 
     @property
     def display(self) -> str:
-        return f"{self.client}:{self.name}" if self.client else self.name
+        return self._display
 
     @property
     def ssh_target(self) -> str:
         """Return the SSH destination string."""
-        if self.ssh_alias:
-            return self.ssh_alias
-        return f"{self.user}@{self.host}"
+        return self._ssh_target
 
 
 @dataclass(frozen=True, slots=True)
@@ -69,7 +93,12 @@ class Client:
 class SSHDefaults:
     """Default SSH options applied globally."""
 
-    options: list[str] = field(default_factory=lambda: ["-o", "ConnectTimeout=10"])
+    options: tuple[str, ...] = ("-o", "ConnectTimeout=10")
+    multiplex: bool = True  # reuse one SSH connection per host via ControlMaster
+
+    def __post_init__(self) -> None:
+        # Keep options immutable so SSHDefaults can key command caches.
+        object.__setattr__(self, "options", tuple(self.options))
 
 
 @dataclass(slots=True)
@@ -83,16 +112,36 @@ class OpsConfig:
 
     # ---------- lookup caches (built once) ----------
     _hosts_by_name: dict[str, list[Host]] = field(default_factory=dict, repr=False)
-    _all_hosts: list[Host] = field(default_factory=list, repr=False)
+    _all_hosts: tuple[Host, ...] = field(default=(), repr=False)
+    _clients_by_name: dict[str, Client] = field(default_factory=dict, repr=False)
+    _hosts_by_qualified: dict[str, Host] = field(default_factory=dict, repr=False)
+    _search_blobs: tuple[str, ...] = field(default=(), repr=False)  # parallel to _all_hosts
+    _hosts_by_tag: dict[str, list[Host]] = field(default_factory=dict, repr=False)
 
     def _build_indexes(self) -> None:
         """Build fast lookup indexes after loading."""
-        self._hosts_by_name.clear()
-        self._all_hosts.clear()
+        all_hosts: list[Host] = []
+        by_name: defaultdict[str, list[Host]] = defaultdict(list)
+        by_tag: defaultdict[str, list[Host]] = defaultdict(list)
+        by_qualified: dict[str, Host] = {}
+        clients_by_name: dict[str, Client] = {}
         for client in self.clients:
+            clients_by_name.setdefault(client.name, client)
             for host in client.hosts:
-                self._all_hosts.append(host)
-                self._hosts_by_name.setdefault(host.name, []).append(host)
+                all_hosts.append(host)
+                by_name[host.name].append(host)
+                by_qualified.setdefault(f"{client.name}:{host.name}", host)
+                for tag in {t.lower() for t in host.tags_set}:
+                    by_tag[tag].append(host)
+
+        self._all_hosts = tuple(all_hosts)
+        self._hosts_by_name = dict(by_name)
+        self._hosts_by_tag = dict(by_tag)
+        self._hosts_by_qualified = by_qualified
+        self._clients_by_name = clients_by_name
+        self._search_blobs = tuple(
+            f"{h.name} {h.host} {h.client} {' '.join(h.tags)}".lower() for h in all_hosts
+        )
 
     @property
     def all_hosts(self) -> list[Host]:
@@ -108,12 +157,10 @@ class OpsConfig:
         Raises ``HostResolutionError`` on ambiguity or missing host.
         """
         if ":" in ref:
+            host = self._hosts_by_qualified.get(ref)
+            if host is not None:
+                return host
             client_name, host_name = ref.split(":", 1)
-            for client in self.clients:
-                if client.name == client_name:
-                    for host in client.hosts:
-                        if host.name == host_name:
-                            return host
             raise HostResolutionError(
                 f"Host '{host_name}' not found under client '{client_name}'."
             )
@@ -132,20 +179,18 @@ class OpsConfig:
         )
 
     def search_hosts(self, query: str) -> list[Host]:
-        """Simple case-insensitive substring search across name, host, tags."""
+        """Simple case-insensitive substring search across name, host, tags.
+
+        ``tag:NAME`` instead matches hosts carrying exactly that tag.
+        """
         q = query.lower()
-        results: list[Host] = []
-        for host in self._all_hosts:
-            haystack = f"{host.name} {host.host} {host.client} {' '.join(host.tags)}".lower()
-            if q in haystack:
-                results.append(host)
-        return results
+        if q.startswith("tag:"):
+            return list(self._hosts_by_tag.get(q[4:], ()))
+        pairs = zip(self._all_hosts, self._search_blobs, strict=True)
+        return [h for h, blob in pairs if q in blob]
 
     def get_client(self, name: str) -> Client | None:
-        for c in self.clients:
-            if c.name == name:
-                return c
-        return None
+        return self._clients_by_name.get(name)
 
 
 # ---------------------------------------------------------------------------
@@ -166,6 +211,20 @@ class HostResolutionError(Exception):
 # ---------------------------------------------------------------------------
 
 
+def control_socket_dir() -> Path:
+    """Directory for SSH ControlMaster sockets (tmpfs runtime dir when available)."""
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return Path(runtime) / APP_NAME
+    return DEFAULT_CONFIG_DIR
+
+
+def _ensure_control_socket_dir() -> None:
+    # ssh falls back to a plain connection if it cannot bind the socket.
+    with contextlib.suppress(OSError):
+        control_socket_dir().mkdir(mode=0o700, parents=True, exist_ok=True)
+
+
 def get_config_path() -> Path:
     """Determine which config file to use."""
     env = os.environ.get(ENV_CONFIG_VAR)
@@ -187,7 +246,7 @@ def _parse_host(data: dict[str, Any], client_name: str) -> Host:
         host=str(hostname),
         user=str(data.get("user", "root")),
         port=int(data.get("port", 22)),
-        tags=[str(t) for t in data.get("tags", [])],
+        tags=tuple(str(t) for t in (data.get("tags") or ())),
         ssh_alias=data.get("ssh_alias"),
         client=client_name,
         compose_path=data.get("compose_path"),
@@ -199,6 +258,8 @@ def _parse_host(data: dict[str, Any], client_name: str) -> Host:
 
 def _parse_client(name: str, data: dict[str, Any]) -> Client:
     """Parse a single client entry from YAML."""
+    # YAML keys may load as ints or bools; intern so every Host.client shares it.
+    name = sys.intern(str(name))
     hosts_data = data.get("hosts", [])
     if not isinstance(hosts_data, list):
         raise ConfigError(f"Client '{name}' 'hosts' must be a list.")
@@ -210,8 +271,95 @@ def _parse_client(name: str, data: dict[str, Any]) -> Client:
     )
 
 
+def _cache_path(config_path: Path) -> Path:
+    return config_path.with_name(config_path.name + CACHE_SUFFIX)
+
+
+def _cache_schema() -> int:
+    """Fingerprint of the pickled dataclass layouts, so field/type changes invalidate caches."""
+    names = ",".join(
+        f"{cls.__name__}.{f.name}:{f.type}" for cls in (Host, Client, SSHDefaults, OpsConfig)
+        for f in fields(cls)
+    )
+    return zlib.crc32(names.encode())
+
+
+def _cache_header(config_path: Path) -> bytes:
+    """Header identifying the config file state (and our version) a cache was built from."""
+    st = config_path.stat()
+    return (
+        f"{APP_NAME} {__version__} {_cache_schema():08x} {st.st_mtime_ns} {st.st_size}\n"
+    ).encode()
+
+
+def _load_cached_config(config_path: Path, header: bytes) -> OpsConfig | None:
+    """Return the cached OpsConfig if it matches *header*, else None.
+
+    The cache is a pickle, so it is only trusted when it is owned by the
+    current user and not writable by group or others.
+    """
+    try:
+        with _cache_path(config_path).open("rb") as f:
+            st = os.fstat(f.fileno())
+            if st.st_uid != os.getuid() or st.st_mode & 0o022:
+                return None  # someone else could have written it; reparse
+            data = f.read()
+    except OSError:
+        return None
+    if not data.startswith(header):
+        return None
+    try:
+        config = pickle.loads(data[len(header):])
+    except Exception:
+        return None  # corrupt or incompatible cache, reparse
+    if not isinstance(config, OpsConfig):
+        return None
+    config.config_path = config_path
+    return config
+
+
+def _store_cached_config(config_path: Path, header: bytes, config: OpsConfig) -> None:
+    """Atomically write the parsed config cache next to the config file."""
+    import tempfile  # only cache writes need it
+
+    cache_path = _cache_path(config_path)
+    try:
+        # mkstemp creates the file with mode 600, like the config itself should be.
+        fd, tmp = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name)
+    except OSError:
+        return  # read-only config dir, non-critical
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            pickle.dump(config, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_path)
+    except OSError:
+        Path(tmp).unlink(missing_ok=True)
+
+
+def _parse_yaml(config_path: Path) -> Any:
+    """Parse the YAML file, importing PyYAML only when a parse is needed."""
+    import yaml
+
+    try:  # LibYAML-backed parser when PyYAML was built with it
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:  # pragma: no cover - pure-Python fallback
+        from yaml import SafeLoader  # type: ignore[assignment]
+
+    try:
+        with config_path.open("rb") as f:  # let the parser stream the file
+            return yaml.load(f, Loader=SafeLoader)
+    except yaml.YAMLError as exc:
+        raise ConfigError(f"Invalid YAML in {config_path}: {exc}") from exc
+
+
 def load_config(path: Path | None = None) -> OpsConfig:
-    """Load, validate, and return OpsConfig from a YAML file."""
+    """Load, validate, and return OpsConfig from a YAML file.
+
+    The parsed result is cached next to the file (``hosts.yaml.cache``) and
+    reused while the file's mtime and size are unchanged. Set
+    ``OPS_NO_CACHE`` to bypass the cache.
+    """
     config_path = path or get_config_path()
 
     if not config_path.exists():
@@ -221,10 +369,16 @@ def load_config(path: Path | None = None) -> OpsConfig:
             f"You can also set {ENV_CONFIG_VAR} environment variable."
         )
 
-    try:
-        raw = yaml.safe_load(config_path.read_text(encoding="utf-8"))
-    except yaml.YAMLError as exc:
-        raise ConfigError(f"Invalid YAML in {config_path}: {exc}") from exc
+    use_cache = not os.environ.get(ENV_NO_CACHE_VAR)
+    if use_cache:
+        header = _cache_header(config_path)
+        cached = _load_cached_config(config_path, header)
+        if cached is not None:
+            if cached.ssh_defaults.multiplex:
+                _ensure_control_socket_dir()
+            return cached
+
+    raw = _parse_yaml(config_path)
 
     if not isinstance(raw, dict):
         raise ConfigError(f"Config file {config_path} must be a YAML mapping at the top level.")
@@ -238,7 +392,11 @@ def load_config(path: Path | None = None) -> OpsConfig:
     # SSH defaults
     defaults_raw = raw.get("defaults", {})
     ssh_opts = defaults_raw.get("ssh_options", ["-o", "ConnectTimeout=10"])
-    ssh_defaults = SSHDefaults(options=list(ssh_opts))
+    # Connection multiplexing, unless disabled or configured by hand in ssh_options
+    multiplex = bool(defaults_raw.get("ssh_multiplex", True)) and not any(
+        "ControlMaster" in str(opt) or "ControlPath" in str(opt) for opt in ssh_opts
+    )
+    ssh_defaults = SSHDefaults(options=tuple(ssh_opts), multiplex=multiplex)
 
     # Clients
     clients_raw = raw.get("clients", {})
@@ -253,6 +411,10 @@ def load_config(path: Path | None = None) -> OpsConfig:
         config_path=config_path,
     )
     config._build_indexes()
+    if ssh_defaults.multiplex:
+        _ensure_control_socket_dir()
+    if use_cache:
+        _store_cached_config(config_path, header, config)
     return config
 
 
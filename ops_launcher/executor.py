@@ -6,12 +6,15 @@ live streaming output, proper exit code propagation, and Rich formatting.
 
 from __future__ import annotations
 
+import codecs
 import os
 import subprocess
 import sys
 
 from ops_launcher.utils import console, err_console, print_command_preview
 
+STREAM_CHUNK_SIZE = 65536
+
 
 def run_interactive(cmd: list[str], *, preview: bool = True) -> int:
     """Run a command interactively, inheriting the terminal's stdin/stdout/stderr.
@@ -23,7 +26,7 @@ def run_interactive(cmd: list[str], *, preview: bool = True) -> int:
         print_command_preview(cmd)
 
     try:
-        result = subprocess.run(cmd, env=os.environ.copy())
+        result = subprocess.run(cmd)
         return result.returncode
     except FileNotFoundError:
         err_console.print(f"[bold red]Command not found:[/bold red] {cmd[0]}")
@@ -42,19 +45,15 @@ def run_streaming(cmd: list[str], *, preview: bool = True) -> int:
     if preview:
         print_command_preview(cmd)
 
-    proc: subprocess.Popen[str] | None = None
+    proc: subprocess.Popen[bytes] | None = None
     try:
         proc = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            env=os.environ.copy(),
         )
         assert proc.stdout is not None
-        for line in proc.stdout:
-            console.print(line, end="", highlight=False)
+        _copy_to_stdout(proc.stdout.fileno())
         proc.wait()
         return proc.returncode
     except FileNotFoundError:
@@ -67,6 +66,25 @@ def run_streaming(cmd: list[str], *, preview: bool = True) -> int:
         return 130
 
 
+def _copy_to_stdout(fd: int) -> None:
+    """Copy raw bytes from *fd* to stdout as they arrive, until EOF.
+
+    Output is passed through untouched: no per-line decoding and no Rich
+    markup parsing of remote text.
+    """
+    sys.stdout.flush()  # keep ordering with anything Rich already wrote
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None:  # text-only stream (e.g. stdout redirected to a StringIO)
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        while chunk := os.read(fd, STREAM_CHUNK_SIZE):
+            sys.stdout.write(decoder.decode(chunk))
+            sys.stdout.flush()
+        return
+    while chunk := os.read(fd, STREAM_CHUNK_SIZE):
+        out.write(chunk)
+        out.flush()
+
+
 def run_capture(cmd: list[str], *, preview: bool = False) -> tuple[int, str]:
     """Run a command and capture its output as a string.
 
@@ -81,7 +99,6 @@ def run_capture(cmd: list[str], *, preview: bool = False) -> tuple[int, str]:
             capture_output=True,
             text=True,
             timeout=30,
-            env=os.environ.copy(),
         )
         return result.returncode, result.stdout + result.stderr
     except subprocess.TimeoutExpired:
@@ -104,7 +121,6 @@ def run_capture_remote(
             capture_output=True,
             text=True,
             timeout=timeout,
-            env=os.environ.copy(),
         )
         return result.returncode, result.stdout.strip()
     except subprocess.TimeoutExpired:
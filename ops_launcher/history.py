@@ -7,19 +7,48 @@ the last N host references used, ordered by most recent first.
 from __future__ import annotations
 
 import json
+import os
+from pathlib import Path
 
 from ops_launcher.config import DEFAULT_CONFIG_DIR
 
+try:  # optional native encoder (pip install ops-launcher[fast])
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
 HISTORY_FILE = DEFAULT_CONFIG_DIR / "history.json"
 MAX_RECENT = 5
 
+# In-process copy of the history, so a TUI session reads the file once.
+_cache: list[str] | None = None
+
+
+def _dumps(data: list[str]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _loads(raw: bytes) -> object:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 def load_recent_hosts() -> list[str]:
     """Load the list of recently used host display names (client:host)."""
+    global _cache
+    if _cache is None:
+        _cache = _read_history()
+    return list(_cache)
+
+
+def _read_history() -> list[str]:
     if not HISTORY_FILE.exists():
         return []
     try:
-        data = json.loads(HISTORY_FILE.read_text(encoding="utf-8"))
+        data = _loads(HISTORY_FILE.read_bytes())
         if isinstance(data, list):
             return [str(h) for h in data[:MAX_RECENT]]
     except (json.JSONDecodeError, OSError):
@@ -29,15 +58,25 @@ def load_recent_hosts() -> list[str]:
 
 def record_host_usage(host_display: str) -> None:
     """Record a host as recently used, pushing it to the top of the list."""
-    recent = load_recent_hosts()
-
-    # Remove if already present, then prepend
-    recent = [h for h in recent if h != host_display]
-    recent.insert(0, host_display)
+    global _cache
+    recent = [host_display]
+    recent.extend(h for h in load_recent_hosts() if h != host_display)
     recent = recent[:MAX_RECENT]
+    _cache = recent
+
+    import tempfile
 
     try:
         HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
-        HISTORY_FILE.write_text(json.dumps(recent), encoding="utf-8")
+        # A unique temp file, so concurrent sessions never replace in each other's writes.
+        fd, tmp = tempfile.mkstemp(dir=HISTORY_FILE.parent, prefix=HISTORY_FILE.name)
+    except OSError:
+        _cache = None  # re-read from disk next time
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_dumps(recent))
+        os.replace(tmp, HISTORY_FILE)
     except OSError:
-        pass  # non-critical, silently ignore
+        Path(tmp).unlink(missing_ok=True)
+        _cache = None
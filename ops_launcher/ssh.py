@@ -6,7 +6,18 @@ custom ports, and global SSH default options. Never stores passwords.
 
 from __future__ import annotations
 
-from ops_launcher.config import Host, SSHDefaults
+from ops_launcher.config import CONTROL_PERSIST, Host, SSHDefaults, control_socket_dir
+
+
+def _multiplex_options(ssh_defaults: SSHDefaults) -> list[str]:
+    """ControlMaster options so repeated connections to a host share one session."""
+    if not ssh_defaults.multiplex:
+        return []
+    return [
+        "-o", "ControlMaster=auto",
+        "-o", f"ControlPath={control_socket_dir() / 'cm-%C'}",
+        "-o", f"ControlPersist={CONTROL_PERSIST}",
+    ]
 
 
 def build_ssh_command(
@@ -37,6 +48,7 @@ def build_ssh_command(
 
     # Global default options
     cmd.extend(ssh_defaults.options)
+    cmd.extend(_multiplex_options(ssh_defaults))
 
     # Port (only if not default and not using alias)
     if not host.ssh_alias and host.port != 22:
@@ -71,6 +83,7 @@ def build_scp_command(
     """Build an ``scp`` command (placeholder for future use)."""
     cmd: list[str] = ["scp"]
     cmd.extend(ssh_defaults.options)
+    cmd.extend(_multiplex_options(ssh_defaults))
 
     if not host.ssh_alias and host.port != 22:
         cmd.extend(["-P", str(host.port)])
@@ -6,17 +6,15 @@ Implements the guided interactive menu flow:
 
 from __future__ import annotations
 
+import functools
 import sys
+from collections.abc import Iterable
+from itertools import groupby
+from typing import TYPE_CHECKING
 
 from rich.table import Table
 
-from ops_launcher.actions import (
-    Action,
-    build_action_command,
-    get_actions_for_host,
-)
-from ops_launcher.config import Host, OpsConfig
-from ops_launcher.executor import run_capture_remote, run_interactive, run_streaming
+from ops_launcher.config import Host, HostResolutionError, OpsConfig
 from ops_launcher.history import load_recent_hosts, record_host_usage
 from ops_launcher.ssh import build_remote_command
 from ops_launcher.utils import (
@@ -29,6 +27,9 @@ from ops_launcher.utils import (
     welcome_panel,
 )
 
+if TYPE_CHECKING:
+    from ops_launcher.actions import Action
+
 # ---------------------------------------------------------------------------
 # Helper functions
 # ---------------------------------------------------------------------------
@@ -41,6 +42,38 @@ def _docker_command(host: Host, command: str) -> str:
     return command
 
 
+# Menu labels are pure functions of immutable config objects, so each one is
+# formatted once per session and reused when the menu is shown again.
+
+
+@functools.cache
+def _recent_host_label(h: Host) -> str:
+    tags_str = ", ".join(h.tags[:3]) if h.tags else ""
+    return (
+        f"[bold yellow]⚡[/bold yellow] [bold]{h.display}[/bold]  "
+        f"[cyan]{h.ssh_target}[/cyan]  [dim]\\[{tags_str}][/dim]"
+    )
+
+
+@functools.cache
+def _client_label(name: str, host_count: int, description: str) -> str:
+    desc = f" — {description}" if description else ""
+    return f"[bold]{name}[/bold]  [dim]({host_count} hosts){desc}[/dim]"
+
+
+@functools.cache
+def _host_label(h: Host) -> str:
+    tags_str = ", ".join(h.tags) if h.tags else "no tags"
+    # Escape the literal bracket so rich doesn't take the tag list for markup.
+    return f"[bold]{h.name}[/bold]  [cyan]{h.ssh_target}[/cyan]  [dim]\\[{tags_str}][/dim]"
+
+
+@functools.cache
+def _action_label(a: Action) -> str:
+    destructive_mark = " [red]⚠[/red]" if a.destructive else ""
+    return f"[bold]{a.label}[/bold]{destructive_mark}  [dim]{a.description}[/dim]"
+
+
 # ---------------------------------------------------------------------------
 # Interactive flow
 # ---------------------------------------------------------------------------
@@ -98,26 +131,19 @@ def _select_client_or_recent(config: OpsConfig) -> int | Host | None:
     for ref in recent_names:
         try:
             recent_hosts.append(config.resolve_host(ref))
-        except Exception:
+        except HostResolutionError:
             continue  # stale entry, skip
 
     labels: list[str] = []
     # Map display index → either ("recent", Host) or ("client", int)
     index_map: list[tuple[str, Host | int]] = []
 
-    if recent_hosts:
-        for h in recent_hosts:
-            tags_str = ", ".join(h.tags[:3]) if h.tags else ""
-            labels.append(
-                f"[bold yellow]⚡[/bold yellow] [bold]{h.display}[/bold]  "
-                f"[cyan]{h.ssh_target}[/cyan]  [dim][{tags_str}][/dim]"
-            )
-            index_map.append(("recent", h))
+    for h in recent_hosts:
+        labels.append(_recent_host_label(h))
+        index_map.append(("recent", h))
 
     for i, c in enumerate(config.clients):
-        host_count = len(c.hosts)
-        desc = f" — {c.description}" if c.description else ""
-        labels.append(f"[bold]{c.name}[/bold]  [dim]({host_count} hosts){desc}[/dim]")
+        labels.append(_client_label(c.name, len(c.hosts), c.description))
         index_map.append(("client", i))
 
     idx = select_with_filter(
@@ -139,12 +165,7 @@ def _select_client_or_recent(config: OpsConfig) -> int | Host | None:
 
 def _select_host(hosts: list[Host], client_name: str) -> int | None:
     """Show host selection menu for a client. Returns index or None."""
-    labels = []
-    for h in hosts:
-        tags_str = ", ".join(h.tags) if h.tags else "no tags"
-        labels.append(
-            f"[bold]{h.name}[/bold]  [cyan]{h.ssh_target}[/cyan]  [dim][{tags_str}][/dim]"
-        )
+    labels = [_host_label(h) for h in hosts]
 
     return select_with_filter(
         labels,
@@ -156,15 +177,14 @@ def _select_host(hosts: list[Host], client_name: str) -> int | None:
 
 def _select_and_run_action(host: Host, config: OpsConfig) -> bool:
     """Show action menu and execute. Returns True to stay on same host, False to go back."""
+    from ops_launcher.actions import get_actions_for_host
+
     actions = get_actions_for_host(host)
     if not actions:
         print_error(f"No actions available for {host.display}.")
         return False
 
-    labels = []
-    for a in actions:
-        destructive_mark = " [red]⚠[/red]" if a.destructive else ""
-        labels.append(f"[bold]{a.label}[/bold]{destructive_mark}  [dim]{a.description}[/dim]")
+    labels = [_action_label(a) for a in actions]
 
     action_idx = select_with_filter(
         labels,
@@ -184,31 +204,34 @@ def _select_and_run_action(host: Host, config: OpsConfig) -> bool:
 def _pick_remote_service(host: Host, config: OpsConfig) -> str | None:
     """Discover running services/containers on a remote host and let the user pick one.
 
-    Tries docker compose ps --services first (if compose_path is set or auto-detected),
-    then falls back to docker ps --format to list running containers.
+    Probes docker compose ps --services and docker ps --format in parallel,
+    preferring the compose services when that probe returns any and falling
+    back to the running container names otherwise.
     Returns the selected service/container name or None.
     """
+    from concurrent.futures import ThreadPoolExecutor
+
     from rich.prompt import Prompt
 
-    services: list[str] = []
+    from ops_launcher.executor import run_capture_remote
 
-    # Try docker compose ps --services first
     cd_prefix = f"cd {host.compose_path} && " if host.compose_path else ""
     compose_remote = f"{cd_prefix}docker compose ps --services 2>/dev/null"
-    compose_cmd = build_remote_command(host, config.ssh_defaults, compose_remote)
-    console.print("  [dim]Discovering compose services...[/dim]")
-    rc, output = run_capture_remote(compose_cmd)
-    if rc == 0 and output.strip():
-        services = [s.strip() for s in output.strip().splitlines() if s.strip()]
+    docker_remote = _docker_command(host, "docker ps --format '{{.Names}}' 2>/dev/null")
+    probes = [
+        build_remote_command(host, config.ssh_defaults, compose_remote),
+        build_remote_command(host, config.ssh_defaults, docker_remote),
+    ]
 
-    # Fallback: list running container names
-    if not services:
-        docker_remote = _docker_command(host, "docker ps --format '{{.Names}}' 2>/dev/null")
-        docker_cmd = build_remote_command(host, config.ssh_defaults, docker_remote)
-        console.print("  [dim]Discovering running containers...[/dim]")
-        rc, output = run_capture_remote(docker_cmd)
+    console.print("  [dim]Discovering compose services and running containers...[/dim]")
+    with ThreadPoolExecutor(max_workers=len(probes)) as pool:
+        results = list(pool.map(run_capture_remote, probes))
+
+    services: list[str] = []
+    for rc, output in results:  # compose first, then docker ps
         if rc == 0 and output.strip():
             services = [s.strip() for s in output.strip().splitlines() if s.strip()]
+            break
 
     if not services:
         print_error("No running services or containers found on this host.")
@@ -225,6 +248,9 @@ def _pick_remote_service(host: Host, config: OpsConfig) -> str | None:
 
 def _execute_action(action: Action, host: Host, config: OpsConfig) -> None:
     """Execute the selected action."""
+    from ops_launcher.actions import build_action_command
+    from ops_launcher.executor import run_interactive, run_streaming
+
     # Destructive actions require confirmation
     if action.destructive and not confirm_action(f"Run '{action.label}' on {host.display}?"):
         print_info("Cancelled.")
@@ -251,7 +277,7 @@ def _execute_action(action: Action, host: Host, config: OpsConfig) -> None:
     )
 
     # Record host usage for recent history
-    record_host_usage(host.name)
+    record_host_usage(host.display)
 
     # SSH action uses exec-style (interactive), others use streaming
     exit_code = run_interactive(cmd) if action.name == "ssh" else run_streaming(cmd)
@@ -267,8 +293,12 @@ def _execute_action(action: Action, host: Host, config: OpsConfig) -> None:
 # ---------------------------------------------------------------------------
 
 
-def print_hosts_table(config: OpsConfig) -> None:
-    """Print a Rich table of all clients and hosts."""
+def print_hosts_table(config: OpsConfig, hosts: Iterable[Host] | None = None) -> None:
+    """Print a Rich table of clients and hosts.
+
+    If *hosts* is given, only those hosts are shown, grouped by client in the
+    order they appear; otherwise every host in *config* is listed.
+    """
     table = Table(
         title="Ops Launcher — All Hosts",
         show_header=True,
@@ -282,20 +312,27 @@ def print_hosts_table(config: OpsConfig) -> None:
     table.add_column("Port", justify="right", min_width=5)
     table.add_column("Tags", style="green", min_width=15)
 
-    for client in config.clients:
-        for i, host in enumerate(client.hosts):
-            client_cell = client.name if i == 0 else ""
-            tags = ", ".join(host.tags) if host.tags else "—"
-            table.add_row(
+    if hosts is None:
+        groups = [(client.name, client.hosts) for client in config.clients]
+    else:
+        groups = [(name, list(group)) for name, group in groupby(hosts, key=lambda h: h.client)]
+
+    add_row = table.add_row
+    last_group = len(groups) - 1
+    for group_idx, (client_name, client_hosts) in enumerate(groups):
+        client_cell = client_name
+        for host in client_hosts:
+            add_row(
                 client_cell,
                 host.name,
                 host.ssh_target,
                 str(host.port),
-                tags,
+                ", ".join(host.tags) or "—",
             )
+            client_cell = ""  # only on the client's first row
         # Add visual separator between clients (except after the last one)
-        if client != config.clients[-1]:
-            table.add_row("", "", "", "", "")
+        if group_idx != last_group:
+            add_row("", "", "", "", "")
 
     console.print()
     console.print(table)
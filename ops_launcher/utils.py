@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import functools
+import re
 import sys
 from typing import TypeVar
 
-from rich.console import Console
+from rich.console import Console, Group, RenderableType
 from rich.panel import Panel
-from rich.prompt import Confirm, Prompt
 from rich.text import Text
 
 # ---------------------------------------------------------------------------
@@ -24,32 +25,44 @@ T = TypeVar("T")
 # ---------------------------------------------------------------------------
 
 
-def fuzzy_match(query: str, candidates: list[str]) -> list[tuple[int, str]]:
+def fuzzy_match(
+    query: str,
+    candidates: list[str],
+    candidates_lower: list[str] | None = None,
+) -> list[tuple[int, str]]:
     """Return (index, candidate) pairs where *query* is a case-insensitive subsequence.
 
     Results are sorted: exact prefix matches first, then subsequence matches.
+    Callers matching repeatedly against the same list can pass
+    *candidates_lower* (the candidates already lowercased) to skip re-lowering.
     """
     q = query.lower()
+    if candidates_lower is None:
+        candidates_lower = [c.lower() for c in candidates]
     prefix_matches: list[tuple[int, str]] = []
     subseq_matches: list[tuple[int, str]] = []
-
-    for idx, candidate in enumerate(candidates):
-        c = candidate.lower()
-        if q in c:
-            if c.startswith(q):
-                prefix_matches.append((idx, candidate))
-            else:
-                subseq_matches.append((idx, candidate))
-        elif _is_subsequence(q, c):
+    lq = len(q)
+
+    for idx, (candidate, c) in enumerate(zip(candidates, candidates_lower, strict=True)):
+        if len(c) < lq:
+            continue  # too short to contain the query in any form
+        pos = c.find(q)
+        if pos == 0:
+            prefix_matches.append((idx, candidate))
+        elif pos > 0 or _is_subsequence(q, c):
             subseq_matches.append((idx, candidate))
 
     return prefix_matches + subseq_matches
 
 
+@functools.lru_cache(maxsize=256)
+def _subseq_regex(needle: str) -> re.Pattern[str]:
+    return re.compile(".*?".join(map(re.escape, needle)), re.DOTALL)
+
+
 def _is_subsequence(needle: str, haystack: str) -> bool:
     """Check if needle chars appear in order within haystack."""
-    it = iter(haystack)
-    return all(ch in it for ch in needle)
+    return _subseq_regex(needle).search(haystack) is not None
 
 
 # ---------------------------------------------------------------------------
@@ -57,6 +70,20 @@ def _is_subsequence(needle: str, haystack: str) -> bool:
 # ---------------------------------------------------------------------------
 
 
+@functools.lru_cache(maxsize=1024)
+def _parse_label(target: Console, label: str) -> Text:
+    return target.render_str(label)
+
+
+def _render_label(label: str) -> Text:
+    """Parse a menu label's markup once; menus are re-shown with the same labels.
+
+    The cache is keyed on the console doing the rendering, and callers get a
+    copy they are free to modify.
+    """
+    return _parse_label(console, label).copy()
+
+
 def select_with_filter(
     items: list[str],
     title: str = "Select",
@@ -67,51 +94,88 @@ def select_with_filter(
     """Present a filterable numbered list and return the selected index, or None for back/exit.
 
     Typing a number selects directly; typing text filters the list.
-    An empty input with allow_back returns None (go back).
+    An empty input with allow_back, or end of input, returns None (go back).
     """
     if not items:
         err_console.print("[red]No items to display.[/red]")
         return None
 
+    from rich.rule import Rule
+
     filtered = list(enumerate(items))  # (original_idx, label)
     current_filter = ""
+    shown: tuple[str, list[int]] | None = None  # (filter, indices) last painted
+
+    # Parse row labels and the hint line once; frames only assemble them.
+    # Filtering matches the text as displayed, not the markup around it, so
+    # a host name at the start of its label ranks as a prefix match.
+    label_texts = [_render_label(label) for label in items]
+    items_lower = [t.plain.lower() for t in label_texts]
+    hints: list[str] = []
+    if allow_back:
+        hints.append("[dim]empty=back[/dim]")
+    if allow_exit:
+        hints.append("[dim]q=exit[/dim]")
+    hints.append("[dim]text=filter[/dim]")
+    hint_line = console.render_str("\n  " + "  ".join(hints))
+
+    # Reserved inputs (compared lowercased); anything else is a number or filter.
+    keywords = {"/": "clear"}
+    if allow_back:
+        keywords[""] = "back"
+    if allow_exit:
+        keywords["q"] = "exit"
+
+    @functools.lru_cache(maxsize=64)
+    def _match(q: str) -> tuple[tuple[int, str], ...]:
+        # Extending the current filter can only narrow its matches, so rescan
+        # just those (in original order) — same result as a full scan.
+        if current_filter and q.startswith(current_filter.lower()):
+            pool = sorted(filtered)
+            pool_idx = [orig_idx for orig_idx, _ in pool]
+            return tuple(
+                (pool_idx[i], label)
+                for i, label in fuzzy_match(
+                    q, [label for _, label in pool], [items_lower[j] for j in pool_idx]
+                )
+            )
+        return tuple(fuzzy_match(q, items, items_lower))
 
     while True:
-        console.print()
-        console.rule(f"[bold cyan]{title}[/bold cyan]")
-        if current_filter:
-            console.print(f"  [dim]Filter: {current_filter}[/dim]")
-
-        for display_num, (orig_idx, label) in enumerate(filtered, start=1):
-            console.print(f"  [bold green]{display_num:>3}[/bold green]  {label}")
-
-        hints: list[str] = []
-        if allow_back:
-            hints.append("[dim]empty=back[/dim]")
-        if allow_exit:
-            hints.append("[dim]q=exit[/dim]")
-        hints.append("[dim]text=filter[/dim]")
-
-        hint_str = "  ".join(hints)
-        console.print(f"\n  {hint_str}")
-
-        raw = Prompt.ask("  [bold]>[/bold]", default="")
-        choice = raw.strip()
-
-        # Back
-        if choice == "" and allow_back:
+        # Only repaint the list when something changed since the last frame;
+        # otherwise just prompt again below the message already shown.
+        state = (current_filter.lower(), [orig_idx for orig_idx, _ in filtered])
+        if state != shown:
+            shown = state
+            # Assemble the whole frame and print it once rather than line by line.
+            frame: list[RenderableType] = ["", Rule(f"[bold cyan]{title}[/bold cyan]")]
+            if current_filter:
+                frame.append(f"  [dim]Filter: {current_filter}[/dim]")
+
+            frame.extend(
+                Text.assemble("  ", (f"{num:>3}", "bold green"), "  ", label_texts[orig_idx])
+                for num, (orig_idx, _) in enumerate(filtered, start=1)
+            )
+            frame.append(hint_line)
+            console.print(Group(*frame))
+
+        console.print("  [bold]>[/bold] ", end="")
+        raw = sys.stdin.readline()
+        if not raw:  # EOF (Ctrl-D / closed stdin)
             return None
-
-        # Exit
-        if choice.lower() == "q" and allow_exit:
-            console.print("[yellow]Exiting.[/yellow]")
-            sys.exit(0)
-
-        # Clear filter
-        if choice.lower() == "/":
-            current_filter = ""
-            filtered = list(enumerate(items))
-            continue
+        choice = raw.strip()
+        lowered = choice.lower()
+
+        match keywords.get(lowered):
+            case "back":
+                return None
+            case "exit":
+                console.print("[yellow]Exiting.[/yellow]")
+                sys.exit(0)
+            case "clear":
+                current_filter = ""
+                filtered = list(enumerate(items))
+                continue
 
         # Numeric selection
         if choice.isdigit():
@@ -122,8 +186,8 @@ def select_with_filter(
             continue
 
         # Text filter
+        matches = list(_match(lowered))
         current_filter = choice
-        matches = fuzzy_match(choice, items)
         if matches:
             filtered = matches
         else:
@@ -139,6 +203,8 @@ def select_with_filter(
 
 def confirm_action(message: str, *, default: bool = False) -> bool:
     """Ask the user to confirm a potentially destructive action."""
+    from rich.prompt import Confirm
+
     return Confirm.ask(f"  [bold yellow]⚠ {message}[/bold yellow]", default=default)
 
 
@@ -0,0 +1,122 @@
+"""Tests for ops_launcher.actions — registry filtering and command building."""
+
+from __future__ import annotations
+
+import pytest
+
+from ops_launcher.actions import (
+    ACTIONS_BY_NAME,
+    BUILTIN_ACTIONS,
+    Action,
+    ActionCategory,
+    build_action_command,
+    get_actions_for_host,
+)
+from ops_launcher.config import Host, SSHDefaults
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def ssh_defaults() -> SSHDefaults:
+    return SSHDefaults(options=["-o", "ConnectTimeout=5"], multiplex=False)
+
+
+@pytest.fixture()
+def docker_host() -> Host:
+    return Host(
+        name="acme-prod",
+        host="prod.acme.io",
+        user="deploy",
+        tags=["prod", "docker"],
+        client="acme",
+        docker_user="app",
+    )
+
+
+# ---------------------------------------------------------------------------
+# Tests — registry
+# ---------------------------------------------------------------------------
+
+
+class TestRegistry:
+    def test_actions_by_name_covers_registry(self):
+        assert len(ACTIONS_BY_NAME) == len(BUILTIN_ACTIONS)
+        assert ACTIONS_BY_NAME["health"].name == "health"
+
+    def test_actions_filtered_by_tags(self, docker_host: Host):
+        names = {a.name for a in get_actions_for_host(docker_host)}
+        assert {"ssh", "health", "docker_ps", "compose_up"} <= names
+        assert "nginx_status" not in names
+
+    def test_available_requires_all_tags(self, docker_host: Host):
+        action = Action(
+            name="multi",
+            label="Multi",
+            category=ActionCategory.HEALTH,
+            required_tags=frozenset({"docker", "nginx"}),
+        )
+        assert not action.is_available_for(docker_host)
+        nginx_host = Host(name="web", host="web.acme.io", tags=["nginx", "docker", "prod"])
+        assert action.is_available_for(nginx_host)
+
+    def test_untagged_host_gets_universal_actions(self):
+        host = Host(name="bare", host="bare.example.com")
+        assert [a.name for a in get_actions_for_host(host)] == ["ssh", "health"]
+
+
+# ---------------------------------------------------------------------------
+# Tests — command building
+# ---------------------------------------------------------------------------
+
+
+class TestBuildActionCommand:
+    def test_ssh(self, docker_host: Host, ssh_defaults: SSHDefaults):
+        cmd = build_action_command(ACTIONS_BY_NAME["ssh"], docker_host, ssh_defaults)
+        assert cmd == ["ssh", "-o", "ConnectTimeout=5", "deploy@prod.acme.io"]
+
+    def test_ssh_multiplexed(self, docker_host: Host, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+        cmd = build_action_command(ACTIONS_BY_NAME["ssh"], docker_host, SSHDefaults())
+        assert "ControlMaster=auto" in cmd
+        assert "ControlPath=/run/user/1000/ops-launcher/cm-%C" in cmd
+        assert cmd[-1] == "deploy@prod.acme.io"
+
+    def test_cached_command_follows_runtime_dir(
+        self, docker_host: Host, monkeypatch: pytest.MonkeyPatch
+    ):
+        action = ACTIONS_BY_NAME["health"]
+        monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+        build_action_command(action, docker_host, SSHDefaults())
+        monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/2000")
+        cmd = build_action_command(action, docker_host, SSHDefaults())
+        assert "ControlPath=/run/user/2000/ops-launcher/cm-%C" in cmd
+
+    def test_docker_ps_uses_docker_user(self, docker_host: Host, ssh_defaults: SSHDefaults):
+        cmd = build_action_command(ACTIONS_BY_NAME["docker_ps"], docker_host, ssh_defaults)
+        assert cmd[-1].startswith("sudo -n -u app docker ps")
+
+    def test_compose_with_path(self, ssh_defaults: SSHDefaults):
+        host = Host(name="stg", host="stg.acme.io", tags=["docker"])
+        cmd = build_action_command(
+            ACTIONS_BY_NAME["compose_up"], host, ssh_defaults, compose_path="/srv/app"
+        )
+        assert cmd[-1] == "cd /srv/app && docker compose up -d"
+
+    def test_compose_logs_allocates_tty(self, docker_host: Host, ssh_defaults: SSHDefaults):
+        cmd = build_action_command(ACTIONS_BY_NAME["compose_logs"], docker_host, ssh_defaults)
+        assert "-t" in cmd
+
+    def test_cached_command_is_fresh_list(self, docker_host: Host, ssh_defaults: SSHDefaults):
+        action = ACTIONS_BY_NAME["health"]
+        first = build_action_command(action, docker_host, ssh_defaults)
+        first.append("mutated")
+        second = build_action_command(action, docker_host, ssh_defaults)
+        assert "mutated" not in second
+
+    def test_unknown_action(self, docker_host: Host, ssh_defaults: SSHDefaults):
+        action = Action(name="bogus", label="Bogus", category=ActionCategory.SSH)
+        with pytest.raises(ValueError, match="Unknown action"):
+            build_action_command(action, docker_host, ssh_defaults)
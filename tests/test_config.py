@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import textwrap
+import pickle
 from pathlib import Path
 
 import pytest
@@ -10,6 +10,7 @@ import pytest
 from ops_launcher.config import (
     ConfigError,
     HostResolutionError,
+    OpsConfig,
     load_config,
     validate_config_file,
 )
@@ -18,79 +19,104 @@ from ops_launcher.config import (
 # Fixtures
 # ---------------------------------------------------------------------------
 
-SAMPLE_YAML = textwrap.dedent("""\
-    version: 1
-    defaults:
-      ssh_options:
-        - "-o"
-        - "ConnectTimeout=5"
-    clients:
-      acme:
-        description: "Acme Corp"
-        hosts:
-          - name: "acme-prod"
-            host: "prod.acme.io"
-            user: "deploy"
-            port: 22
-            tags: ["prod", "docker", "django"]
-          - name: "acme-stg"
-            host: "stg.acme.io"
-            user: "ubuntu"
-            port: 2222
-            tags: ["stg", "docker"]
-      personal:
-        description: "Personal"
-        hosts:
-          - name: "myserver"
-            host: "my.server.dev"
-            user: "user"
-            tags: ["prod", "personal"]
-            ssh_alias: "myalias"
-""")
-
-MINIMAL_YAML = textwrap.dedent("""\
-    version: 1
-    clients:
-      test:
-        hosts:
-          - name: "t1"
-            host: "t1.example.com"
-""")
-
-BAD_VERSION_YAML = textwrap.dedent("""\
-    version: 99
-    clients: {}
-""")
-
-MISSING_HOST_FIELD_YAML = textwrap.dedent("""\
-    version: 1
-    clients:
-      broken:
-        hosts:
-          - name: "no-host-field"
-""")
-
-DUPLICATE_NAME_YAML = textwrap.dedent("""\
-    version: 1
-    clients:
-      alpha:
-        hosts:
-          - name: "shared"
-            host: "a.example.com"
-      beta:
-        hosts:
-          - name: "shared"
-            host: "b.example.com"
-""")
+SAMPLE_YAML = """\
+version: 1
+defaults:
+  ssh_options:
+    - "-o"
+    - "ConnectTimeout=5"
+clients:
+  acme:
+    description: "Acme Corp"
+    hosts:
+      - name: "acme-prod"
+        host: "prod.acme.io"
+        user: "deploy"
+        port: 22
+        tags: ["prod", "docker", "django"]
+      - name: "acme-stg"
+        host: "stg.acme.io"
+        user: "ubuntu"
+        port: 2222
+        tags: ["stg", "docker"]
+  personal:
+    description: "Personal"
+    hosts:
+      - name: "myserver"
+        host: "my.server.dev"
+        user: "user"
+        tags: ["prod", "personal"]
+        ssh_alias: "myalias"
+"""
+
+MINIMAL_YAML = """\
+version: 1
+clients:
+  test:
+    hosts:
+      - name: "t1"
+        host: "t1.example.com"
+"""
+
+BAD_VERSION_YAML = """\
+version: 99
+clients: {}
+"""
+
+MISSING_HOST_FIELD_YAML = """\
+version: 1
+clients:
+  broken:
+    hosts:
+      - name: "no-host-field"
+"""
+
+DUPLICATE_NAME_YAML = """\
+version: 1
+clients:
+  alpha:
+    hosts:
+      - name: "shared"
+        host: "a.example.com"
+  beta:
+    hosts:
+      - name: "shared"
+        host: "b.example.com"
+"""
+
+
+SAMPLE_YAML_BYTES = SAMPLE_YAML.encode()
+
+
+@pytest.fixture(autouse=True)
+def _runtime_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Keep ControlMaster socket dirs created by load_config inside tmp_path.
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path / "run"))
 
 
 @pytest.fixture()
 def sample_config(tmp_path: Path) -> Path:
     p = tmp_path / "hosts.yaml"
-    p.write_text(SAMPLE_YAML)
+    p.write_bytes(SAMPLE_YAML_BYTES)
     return p
 
 
+@pytest.fixture(scope="session")
+def shared_sample_config(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """SAMPLE_YAML written once; only for tests that never modify the file."""
+    p = tmp_path_factory.mktemp("sample") / "hosts.yaml"
+    p.write_bytes(SAMPLE_YAML_BYTES)
+    return p
+
+
+@pytest.fixture(scope="session")
+def sample_cfg(shared_sample_config: Path) -> OpsConfig:
+    """SAMPLE_YAML loaded once, for tests that only read the config."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("XDG_RUNTIME_DIR", str(shared_sample_config.parent / "run"))
+        return load_config(shared_sample_config)
+
+
 @pytest.fixture()
 def minimal_config(tmp_path: Path) -> Path:
     p = tmp_path / "hosts.yaml"
@@ -125,36 +151,53 @@ def duplicate_config(tmp_path: Path) -> Path:
 
 
 class TestLoadConfig:
-    def test_load_sample(self, sample_config: Path):
-        cfg = load_config(sample_config)
-        assert cfg.version == 1
-        assert len(cfg.clients) == 2
-        assert len(cfg.all_hosts) == 3
+    def test_load_sample(self, sample_cfg: OpsConfig):
+        assert sample_cfg.version == 1
+        assert len(sample_cfg.clients) == 2
+        assert len(sample_cfg.all_hosts) == 3
 
-    def test_ssh_defaults(self, sample_config: Path):
-        cfg = load_config(sample_config)
-        assert "-o" in cfg.ssh_defaults.options
-        assert "ConnectTimeout=5" in cfg.ssh_defaults.options
+    def test_ssh_defaults(self, sample_cfg: OpsConfig):
+        assert "-o" in sample_cfg.ssh_defaults.options
+        assert "ConnectTimeout=5" in sample_cfg.ssh_defaults.options
 
-    def test_host_fields(self, sample_config: Path):
-        cfg = load_config(sample_config)
-        host = cfg.resolve_host("acme-prod")
+    def test_host_fields(self, sample_cfg: OpsConfig):
+        host = sample_cfg.resolve_host("acme-prod")
         assert host.host == "prod.acme.io"
         assert host.user == "deploy"
         assert host.port == 22
         assert "docker" in host.tags
         assert host.client == "acme"
 
-    def test_ssh_alias(self, sample_config: Path):
-        cfg = load_config(sample_config)
-        host = cfg.resolve_host("myserver")
-        assert host.ssh_alias == "myalias"
-        assert host.ssh_target == "myalias"
+    def test_host_tags_set(self, sample_cfg: OpsConfig):
+        host = sample_cfg.resolve_host("acme-prod")
+        assert host.tags_set == frozenset({"prod", "docker", "django"})
 
-    def test_ssh_target_without_alias(self, sample_config: Path):
+    def test_ssh_multiplex_default(self, sample_config: Path, tmp_path: Path):
         cfg = load_config(sample_config)
-        host = cfg.resolve_host("acme-prod")
-        assert host.ssh_target == "deploy@prod.acme.io"
+        assert cfg.ssh_defaults.multiplex is True
+        assert (tmp_path / "run" / "ops-launcher").is_dir()
+
+    def test_ssh_multiplex_opt_out(self, tmp_path: Path):
+        p = tmp_path / "hosts.yaml"
+        p.write_text(MINIMAL_YAML + "defaults:\n  ssh_multiplex: false\n")
+        assert load_config(p).ssh_defaults.multiplex is False
+
+    def test_ssh_multiplex_respects_manual_control_path(self, tmp_path: Path):
+        p = tmp_path / "hosts.yaml"
+        p.write_text(
+            MINIMAL_YAML + 'defaults:\n  ssh_options: ["-o", "ControlPath=~/.ssh/cm-%C"]\n'
+        )
+        assert load_config(p).ssh_defaults.multiplex is False
+
+    def test_ssh_alias(self, sample_cfg: OpsConfig):
+        assert sample_cfg.resolve_host("myserver").ssh_alias == "myalias"
+
+    @pytest.mark.parametrize(
+        ("ref", "target"),
+        [("myserver", "myalias"), ("acme-prod", "deploy@prod.acme.io")],
+    )
+    def test_ssh_target(self, sample_cfg: OpsConfig, ref: str, target: str):
+        assert sample_cfg.resolve_host(ref).ssh_target == target
 
     def test_minimal_config(self, minimal_config: Path):
         cfg = load_config(minimal_config)
@@ -163,6 +206,13 @@ class TestLoadConfig:
         assert host.user == "root"  # default
         assert host.port == 22  # default
 
+    def test_numeric_client_key(self, tmp_path: Path):
+        p = tmp_path / "hosts.yaml"
+        p.write_text("version: 1\nclients:\n  123:\n    hosts:\n      - {name: a, host: b}\n")
+        cfg = load_config(p)
+        assert cfg.clients[0].name == "123"
+        assert cfg.resolve_host("123:a").client == "123"
+
     def test_missing_file(self, tmp_path: Path):
         with pytest.raises(ConfigError, match="Config file not found"):
             load_config(tmp_path / "nonexistent.yaml")
@@ -194,20 +244,16 @@ class TestLoadConfig:
 
 
 class TestHostResolution:
-    def test_resolve_unique_name(self, sample_config: Path):
-        cfg = load_config(sample_config)
-        host = cfg.resolve_host("acme-stg")
-        assert host.name == "acme-stg"
-
-    def test_resolve_qualified(self, sample_config: Path):
-        cfg = load_config(sample_config)
-        host = cfg.resolve_host("acme:acme-prod")
-        assert host.name == "acme-prod"
-
-    def test_resolve_unknown(self, sample_config: Path):
-        cfg = load_config(sample_config)
+    @pytest.mark.parametrize(
+        ("ref", "name"),
+        [("acme-stg", "acme-stg"), ("acme:acme-prod", "acme-prod")],
+    )
+    def test_resolve(self, sample_cfg: OpsConfig, ref: str, name: str):
+        assert sample_cfg.resolve_host(ref).name == name
+
+    def test_resolve_unknown(self, sample_cfg: OpsConfig):
         with pytest.raises(HostResolutionError, match="Unknown host"):
-            cfg.resolve_host("nonexistent")
+            sample_cfg.resolve_host("nonexistent")
 
     def test_resolve_ambiguous(self, duplicate_config: Path):
         cfg = load_config(duplicate_config)
@@ -219,10 +265,15 @@ class TestHostResolution:
         host = cfg.resolve_host("alpha:shared")
         assert host.host == "a.example.com"
 
-    def test_resolve_bad_qualifier(self, sample_config: Path):
-        cfg = load_config(sample_config)
+    def test_resolve_bad_qualifier(self, sample_cfg: OpsConfig):
         with pytest.raises(HostResolutionError, match="not found under client"):
-            cfg.resolve_host("nonexistent:acme-prod")
+            sample_cfg.resolve_host("nonexistent:acme-prod")
+
+    def test_get_client(self, sample_cfg: OpsConfig):
+        client = sample_cfg.get_client("acme")
+        assert client is not None
+        assert client.description == "Acme Corp"
+        assert sample_cfg.get_client("nonexistent") is None
 
 
 # ---------------------------------------------------------------------------
@@ -231,27 +282,72 @@ class TestHostResolution:
 
 
 class TestSearch:
-    def test_search_by_name(self, sample_config: Path):
-        cfg = load_config(sample_config)
-        results = cfg.search_hosts("acme")
+    def test_search_by_name(self, sample_cfg: OpsConfig):
+        results = sample_cfg.search_hosts("acme")
         assert len(results) == 2
 
-    def test_search_by_tag(self, sample_config: Path):
-        cfg = load_config(sample_config)
-        results = cfg.search_hosts("django")
+    def test_search_by_tag(self, sample_cfg: OpsConfig):
+        results = sample_cfg.search_hosts("django")
         assert len(results) == 1
         assert results[0].name == "acme-prod"
 
-    def test_search_by_host(self, sample_config: Path):
-        cfg = load_config(sample_config)
-        results = cfg.search_hosts("server.dev")
+    def test_search_by_host(self, sample_cfg: OpsConfig):
+        results = sample_cfg.search_hosts("server.dev")
         assert len(results) == 1
 
-    def test_search_no_match(self, sample_config: Path):
-        cfg = load_config(sample_config)
-        results = cfg.search_hosts("zzzznotfound")
+    def test_search_no_match(self, sample_cfg: OpsConfig):
+        results = sample_cfg.search_hosts("zzzznotfound")
         assert len(results) == 0
 
+    def test_search_exact_tag(self, sample_cfg: OpsConfig):
+        assert [h.name for h in sample_cfg.search_hosts("tag:PROD")] == ["acme-prod", "myserver"]
+        assert sample_cfg.search_hosts("tag:dock") == []
+
+
+# ---------------------------------------------------------------------------
+# Tests — parsed config cache
+# ---------------------------------------------------------------------------
+
+
+class TestConfigCache:
+    def test_cache_written_and_reused(self, sample_config: Path):
+        first = load_config(sample_config)
+        cache = sample_config.with_name("hosts.yaml.cache")
+        assert cache.exists()
+        second = load_config(sample_config)
+        assert second.all_hosts == first.all_hosts
+        assert second.resolve_host("acme:acme-prod").tags_set == {"prod", "docker", "django"}
+
+    def test_cache_invalidated_on_change(self, sample_config: Path):
+        load_config(sample_config)
+        sample_config.write_text(MINIMAL_YAML)
+        cfg = load_config(sample_config)
+        assert [h.name for h in cfg.all_hosts] == ["t1"]
+
+    def test_corrupt_cache_ignored(self, sample_config: Path):
+        load_config(sample_config)
+        cache = sample_config.with_name("hosts.yaml.cache")
+        header = cache.read_bytes().split(b"\n", 1)[0]
+        cache.write_bytes(header + b"\nnot a pickle")
+        assert len(load_config(sample_config).all_hosts) == 3
+
+    def test_writable_cache_ignored(self, sample_config: Path):
+        load_config(sample_config)
+        cache = sample_config.with_name("hosts.yaml.cache")
+        header = cache.read_bytes().split(b"\n", 1)[0] + b"\n"
+        forged = header + pickle.dumps(OpsConfig(clients=[]))
+        cache.write_bytes(forged)
+        cache.chmod(0o600)
+        assert load_config(sample_config).all_hosts == []  # trusted when private
+        cache.write_bytes(forged)
+        cache.chmod(0o620)
+        assert len(load_config(sample_config).all_hosts) == 3
+
+    def test_cache_disabled_by_env(self, sample_config: Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("OPS_NO_CACHE", "1")
+        load_config(sample_config)
+        assert not sample_config.with_name("hosts.yaml.cache").exists()
+
 
 # ---------------------------------------------------------------------------
 # Tests — validation helper
@@ -259,8 +355,8 @@ class TestSearch:
 
 
 class TestValidation:
-    def test_validate_ok(self, sample_config: Path):
-        ok, msg = validate_config_file(sample_config)
+    def test_validate_ok(self, shared_sample_config: Path):
+        ok, msg = validate_config_file(shared_sample_config)
         assert ok is True
         assert "2 client(s)" in msg
         assert "3 host(s)" in msg
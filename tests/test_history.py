@@ -0,0 +1,55 @@
+"""Tests for ops_launcher.history — recent-host tracking."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from ops_launcher import history
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(autouse=True)
+def history_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "history.json"
+    monkeypatch.setattr(history, "HISTORY_FILE", path)
+    monkeypatch.setattr(history, "_cache", None)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Tests — recording and loading
+# ---------------------------------------------------------------------------
+
+
+class TestHistory:
+    def test_most_recent_first_without_duplicates(self, history_file: Path):
+        for ref in ["a:1", "b:2", "a:1", "c:3"]:
+            history.record_host_usage(ref)
+        assert history.load_recent_hosts() == ["c:3", "a:1", "b:2"]
+        assert json.loads(history_file.read_bytes()) == ["c:3", "a:1", "b:2"]
+
+    def test_capped_at_max_recent(self):
+        for i in range(history.MAX_RECENT + 3):
+            history.record_host_usage(f"h:{i}")
+        recent = history.load_recent_hosts()
+        assert len(recent) == history.MAX_RECENT
+        assert recent[0] == f"h:{history.MAX_RECENT + 2}"
+
+    def test_reads_file_once_per_session(self, history_file: Path):
+        history_file.write_text('["x:1"]')
+        assert history.load_recent_hosts() == ["x:1"]
+        history_file.write_text('["y:2"]')
+        assert history.load_recent_hosts() == ["x:1"]
+
+    def test_corrupt_file_recovers(self, history_file: Path):
+        history_file.write_text("{not json")
+        assert history.load_recent_hosts() == []
+        history.record_host_usage("a:1")
+        assert json.loads(history_file.read_bytes()) == ["a:1"]
+        assert list(history_file.parent.iterdir()) == [history_file]  # no temp files left
@@ -0,0 +1,153 @@
+"""Tests for ops_launcher.utils — fuzzy matching."""
+
+from __future__ import annotations
+
+import io
+
+import pytest
+from rich.console import Console
+
+from ops_launcher import utils
+from ops_launcher.config import Host
+from ops_launcher.tui import _host_label
+from ops_launcher.utils import _is_subsequence, _render_label, fuzzy_match
+
+LABELS = ["acme-prod", "acme-staging", "myserver", "Prod-DB", "web"]
+
+# ---------------------------------------------------------------------------
+# Tests — fuzzy_match
+# ---------------------------------------------------------------------------
+
+
+class TestFuzzyMatch:
+    def test_prefix_before_substring(self):
+        assert fuzzy_match("prod", LABELS) == [(3, "Prod-DB"), (0, "acme-prod")]
+
+    def test_subsequence(self):
+        assert fuzzy_match("msv", LABELS) == [(2, "myserver")]
+
+    def test_case_insensitive(self):
+        assert fuzzy_match("ACME", LABELS) == [(0, "acme-prod"), (1, "acme-staging")]
+
+    def test_non_ascii_case_insensitive(self):
+        assert fuzzy_match("münchen", ["MÜNCHEN-db", "munich"]) == [(0, "MÜNCHEN-db")]
+
+    def test_no_match(self):
+        assert fuzzy_match("zzz", LABELS) == []
+
+    def test_subsequence_is_not_substring(self):
+        assert _is_subsequence("apd", "acme-prod")
+        assert not _is_subsequence("dpa", "acme-prod")
+
+    def test_subsequence_escapes_metacharacters(self):
+        assert _is_subsequence("a.b", "a-x.b")
+        assert not _is_subsequence("a.b", "axb")
+        assert _is_subsequence("(*", "x(y*")
+
+    def test_mismatched_lowercase_rejected(self):
+        with pytest.raises(ValueError):
+            fuzzy_match("acme", LABELS, ["acme-prod"])
+
+    def test_precomputed_lowercase(self):
+        lowered = [s.lower() for s in LABELS]
+        for query in ("prod", "ap", "w", "xyz"):
+            assert fuzzy_match(query, LABELS, lowered) == fuzzy_match(query, LABELS)
+
+
+# ---------------------------------------------------------------------------
+# Tests — label rendering
+# ---------------------------------------------------------------------------
+
+
+class TestRenderLabel:
+    def test_returns_independent_copies(self):
+        first = _render_label("[bold]acme-prod[/bold]")
+        first.append(" mutated")
+        first.stylize("red")
+        second = _render_label("[bold]acme-prod[/bold]")
+        assert second.plain == "acme-prod"
+        assert [s.style for s in second.spans] == ["bold"]
+
+    def test_uses_current_console(self, monkeypatch: pytest.MonkeyPatch):
+        assert _render_label("[bold]x[/bold]").spans
+        monkeypatch.setattr(utils, "console", Console(markup=False))
+        assert _render_label("[bold]x[/bold]").plain == "[bold]x[/bold]"
+
+
+# ---------------------------------------------------------------------------
+# Tests — select_with_filter
+# ---------------------------------------------------------------------------
+
+
+class TestSelectWithFilter:
+    def _run(self, monkeypatch: pytest.MonkeyPatch, answers: list[str]) -> int | None:
+        monkeypatch.setattr("sys.stdin", io.StringIO("".join(f"{a}\n" for a in answers)))
+        return utils.select_with_filter(LABELS, title="Test")
+
+    def test_number_selects_original_index(self, monkeypatch: pytest.MonkeyPatch):
+        assert self._run(monkeypatch, ["3"]) == 2
+
+    def test_empty_goes_back(self, monkeypatch: pytest.MonkeyPatch):
+        assert self._run(monkeypatch, [""]) is None
+
+    def test_eof_goes_back(self, monkeypatch: pytest.MonkeyPatch):
+        assert self._run(monkeypatch, ["web"]) is None
+
+    def test_refined_filter(self, monkeypatch: pytest.MonkeyPatch):
+        # "p" keeps Prod-DB first; extending to "pr" narrows within those matches.
+        assert self._run(monkeypatch, ["p", "pr", "2"]) == 0
+
+    def test_clear_filter(self, monkeypatch: pytest.MonkeyPatch):
+        assert self._run(monkeypatch, ["web", "/", "1"]) == 0
+
+    def test_repeated_filter_is_cached(self, monkeypatch: pytest.MonkeyPatch):
+        calls: list[str] = []
+        real = utils.fuzzy_match
+
+        def counting(query: str, *args: object) -> list[tuple[int, str]]:
+            calls.append(query)
+            return real(query, *args)
+
+        monkeypatch.setattr(utils, "fuzzy_match", counting)
+        assert self._run(monkeypatch, ["acme", "/", "ACME", "2"]) == 1
+        assert calls == ["acme"]
+
+    def test_invalid_number_does_not_repaint(self, monkeypatch: pytest.MonkeyPatch):
+        out = io.StringIO()
+        monkeypatch.setattr(utils, "console", Console(file=out, width=80))
+        monkeypatch.setattr(utils, "err_console", Console(file=io.StringIO()))
+        assert self._run(monkeypatch, ["9", "1"]) == 0
+        assert out.getvalue().count("Test") == 1
+
+    def test_unchanged_filter_does_not_repaint(self, monkeypatch: pytest.MonkeyPatch):
+        out = io.StringIO()
+        monkeypatch.setattr(utils, "console", Console(file=out, width=80))
+        assert self._run(monkeypatch, ["/", "acme", "ACME", "1"]) == 0
+        assert out.getvalue().count("Test") == 2
+
+    def test_filter_ignores_markup(self, monkeypatch: pytest.MonkeyPatch):
+        items = ["[dim]db[/dim] web-2", "[bold]web-1[/bold]"]
+        replies = io.StringIO("web\n1\n")
+        monkeypatch.setattr("sys.stdin", replies)
+        assert utils.select_with_filter(items) == 1  # prefix match ranks first
+        replies = io.StringIO("bold\n1\n")
+        monkeypatch.setattr("sys.stdin", replies)
+        monkeypatch.setattr(utils, "err_console", Console(file=io.StringIO()))
+        assert utils.select_with_filter(items) == 0  # no match on tag names
+
+    def test_filter_host_labels_by_tag(self, monkeypatch: pytest.MonkeyPatch):
+        hosts = [
+            Host(name="acme-prod", host="prod.acme.io", tags=["prod", "docker"]),
+            Host(name="acme-db", host="db.acme.io", tags=["prod", "postgres", "backups"]),
+        ]
+        monkeypatch.setattr("sys.stdin", io.StringIO("backups\n1\n"))
+        assert utils.select_with_filter([_host_label(h) for h in hosts]) == 1
+
+    def test_quit_exits(self, monkeypatch: pytest.MonkeyPatch):
+        with pytest.raises(SystemExit):
+            self._run(monkeypatch, ["Q"])
+
+    def test_quit_is_a_filter_without_allow_exit(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr("sys.stdin", io.StringIO("q\n1\n"))
+        monkeypatch.setattr(utils, "err_console", Console(file=io.StringIO()))
+        assert utils.select_with_filter(LABELS, allow_exit=False) == 0